@@ -0,0 +1,9 @@
+from functools import lru_cache
+from mako.template import Template
+
+@lru_cache(maxsize=None)
+def _compiled(src):
+    """
+    Compile the codelet string into a Mako template only once
+    """
+    return Template(src)
@@ -1,12 +1,16 @@
-from mako.template import Template
+from types import MappingProxyType
 import numpy as np
 from scipy.constants import c
 
+from .codelets import _compiled
 from .codelets.laser import LaserProfile
 from .codelets.fieldBackground import LaserAntenna
 from .codelets.fieldBackground import r2_2d, r2_3d
 from .codelets.fieldBackground import laser_profile_2d, laser_profile_3d
 
+_POLARISATION_MAP = MappingProxyType( { 'x':'LINEAR_X', 'z':'LINEAR_Z',
+                                        'circ':'CIRCULAR' } )
+
 class Laser:
     """
     Class that defines laser using either native PIConGPU
@@ -94,10 +98,9 @@ class Laser:
         if method=='native':
             params['tau'] = ctau / c / 2
             params['injection_duration'] = 2 * cdelay / c / params['tau']
-            params['pol'] = { 'x':'LINEAR_X', 'z':'LINEAR_Z',
-                              'circ':'CIRCULAR' }[pol]
+            params['pol'] = _POLARISATION_MAP[pol]
             params['MODENUMBER'] = LMNum
-            params['LAGUERREMODES'] = ", ".join([str(m) for m in LM])
+            params['LAGUERREMODES'] = ", ".join(f"{m:.15e}" for m in LM)
         elif method=='antenna':
             params['tau'] = ctau / c
             params['delay'] = cdelay / c
@@ -106,11 +109,11 @@ class Laser:
             params['ix_cntr'] = center_ij[0]
             params['iz_cntr'] = center_ij[1]
             if dim=='3d':
-               params['r2'] = Template(r2_3d).render(**params)
-               params['laser_profile'] = Template(laser_profile_3d).render(**params)
+               params['r2'] = _compiled(r2_3d).render(**params)
+               params['laser_profile'] = _compiled(laser_profile_3d).render(**params)
             elif dim=='2d':
-               params['r2'] = Template(r2_2d).render(**params)
-               params['laser_profile'] = Template(laser_profile_2d).render(**params)
+               params['r2'] = _compiled(r2_2d).render(**params)
+               params['laser_profile'] = _compiled(laser_profile_2d).render(**params)
             
         # Converting float and integer arguments to strings
         for arg in params.keys():
@@ -124,7 +127,7 @@ class Laser:
         if method=='native':
             template['filename'] = 'laser.template'
             template['Main'] = {}
-            template['Main']["laserProfile"] = Template( \
+            template['Main']["laserProfile"] = _compiled( \
                 LaserProfile[profile] ).render(**params)
 
         elif method=='antenna':
@@ -132,7 +135,7 @@ class Laser:
 
             template['Appendable'] = {}
             template['Appendable']['\n'] = {}
-            template['Appendable']['\n']['Antenna'] = Template( \
+            template['Appendable']['\n']['Antenna'] = _compiled( \
                LaserAntenna[profile] ).render(**params)
 
         self.templates = [template,]
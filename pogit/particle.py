@@ -1,8 +1,10 @@
-from mako.template import Template
+from functools import lru_cache
+from types import MappingProxyType
 import numpy as np
 from scipy.constants import c, atomic_mass, m_e, m_p
 from mendeleev import element as table_element
 
+from .codelets import _compiled
 from .codelets.particle import StartPosition, Manipulators
 from .codelets.density import densityProfile
 from .codelets.species import speciesNumericalParam
@@ -11,6 +13,53 @@ from .codelets.speciesInitialization import CreateDensity
 from .codelets.speciesInitialization import SetIonCharge
 from .codelets.speciesInitialization import SetIonNeutral
 
+_PARTICLE_SHAPE_MAP = MappingProxyType( { 1: "CIC",
+                                          2: "TSC",
+                                          3: "PCS",
+                                          4: "P4S" } )
+
+@lru_cache(maxsize=128)
+def _element_props(name):
+    """
+    Get mass and charge ratios of the element from the periodic table
+    """
+    el = table_element(name)
+    return el.mass * atomic_mass / m_e, -el.atomic_number
+
+def _iter_manipulators(species, initial_temperature, params):
+    """
+    Yield rendered manipulators codelets of the species
+    """
+    # configure initial charge manipulator for ionizable
+    if species=='generic_ionizable' or species=='ion':
+        yield _compiled( Manipulators['SetIonCharge'] ).render(**params)
+
+    # configure temperature manipulator
+    if initial_temperature is not None:
+        yield _compiled( Manipulators['Temperature'] ).render(**params)
+
+def _iter_create_manipulate(species, density_profile, initial_charge, params):
+    """
+    Yield rendered codelets of species creation and manipulators
+    applications
+    """
+    if density_profile is not None:
+        if type(density_profile) in (list, tuple):
+            # if multiple entries create with enumerated indices
+            for profile_index, _ in enumerate(density_profile):
+                yield _compiled(CreateDensity).render(
+                    profile_index=str(profile_index), **params)
+        else:
+            # if single entry set index to 0
+            yield _compiled(CreateDensity).render(profile_index='0', **params)
+
+    # apply initial charge manipulator for ionizable
+    if species=='generic_ionizable' or species=='ion':
+        if initial_charge==0:
+            yield _compiled(SetIonNeutral).render(**params)
+        else:
+            yield _compiled(SetIonCharge).render(**params)
+
 class Particle:
     """
     Class that contains parameters of the particle species
@@ -135,10 +184,7 @@ class Particle:
         params = {}
         params['name'] = name
         params['type'] = species
-        params['ParticleShape'] = {1: "CIC",
-                                   2: "TSC",
-                                   3: "PCS",
-                                   4: "P4S"}[shape_order]
+        params['ParticleShape'] = _PARTICLE_SHAPE_MAP[shape_order]
 
         params['CurrentSolver'] =  current_deposition
         if params['type']=='probe':
@@ -181,17 +227,18 @@ class Particle:
             params["MassRatio"] = mass_ratio
             params["ChargeRatio"] = charge_ratio
         elif species=='ion':
-            el = table_element(element)
-            params["MassRatio"] = el.mass * atomic_mass / m_e
-            params["ChargeRatio"] = -el.atomic_number
+            mass_ratio, charge_ratio = _element_props(element)
+            params["MassRatio"] = mass_ratio
+            params["ChargeRatio"] = charge_ratio
 
         # Converting float and integer arguments to strings
-        for arg in params.keys():
-            if type(params[arg]) == float:
+        for arg, value in params.items():
+            if isinstance(value, float):
                 # Imposing a fixed float format
-                params[arg] = f"{params[arg]:.15e}"
-            if type(params[arg]) == int:
-                params[arg] = f"{params[arg]:d}"
+                params[arg] = format(value, '.15e')
+            elif isinstance(value, (int, np.integer)) and \
+                    not isinstance(value, bool):
+                params[arg] = str(value)
 
         # NOW GO TEMPLATES
         # Generic parameters
@@ -200,7 +247,7 @@ class Particle:
         template_species['Appendable'] = {}
         template_species['Appendable']['\n'] = {}
         template_species['Appendable']['\n']['speciesNumericalParam']= \
-            Template(speciesNumericalParam).render(**params)
+            _compiled(speciesNumericalParam).render(**params)
 
         # Species definition
         template_speciesDefinition = {}
@@ -210,7 +257,7 @@ class Particle:
         template_speciesDefinition['Appendable'][',\n'] = {}
 
         template_speciesDefinition['Appendable']['\n']['SpeciesDefinition'] = \
-            Template(speciesDefinition[species]).render(**params)
+            _compiled(speciesDefinition[species]).render(**params)
         template_speciesDefinition['Appendable'][',\n']['SpeciesRuntimeName'] =\
             'PIC_' + name
 
@@ -224,24 +271,12 @@ class Particle:
         template_particle['Appendable']['\n'] = {}
 
         if initial_positions is not None:
-            template_particle['Appendable']['\n']['StartPosition'] = Template( \
+            template_particle['Appendable']['\n']['StartPosition'] = _compiled( \
                 StartPosition[initial_positions[0]] ).render(**params)
 
-        manipulator_list = []
-
-        # configure initial charge manipulator for ionizable
-        if species=='generic_ionizable' or species=='ion':
-            manipulator_list.append( Template( Manipulators['SetIonCharge'] )\
-                .render(**params) )
-
-        # configure temperature manipulator
-        if initial_temperature is not None:
-            manipulator_list.append( Template( Manipulators['Temperature'])\
-                .render(**params) )
-
         # add manipulators
         template_particle['Appendable']['\n']['Manipulators'] = \
-            "\n".join(manipulator_list)
+            "\n".join(_iter_manipulators(species, initial_temperature, params))
 
         # Species initialization
         template_speciesInitialization = {}
@@ -251,33 +286,13 @@ class Particle:
         template_speciesInitialization['Appendable'] = {}
         template_speciesInitialization['Appendable'][',\n'] = {}
 
-        createManipulate_list = []
-        if density_profile is not None:
-            if type(density_profile) in (list, tuple):
-                # if multiple entries create with enumerated indices
-                for profile_index, prof in enumerate(density_profile):
-                    params['profile_index'] = str(profile_index)
-                    createManipulate_list.append( Template(CreateDensity)\
-                                                  .render(**params))
-            else:
-                # if single entry set index to 0
-                params['profile_index'] = '0'
-                createManipulate_list.append( Template(CreateDensity)\
-                                              .render(**params))
-
-        # apply initial charge manipulator for ionizable
-        if species=='generic_ionizable' or species=='ion':
-            if initial_charge==0:
-                createManipulate_list.append( Template(SetIonNeutral)\
-                                              .render(**params))
-            else:
-                createManipulate_list.append( Template(SetIonCharge)\
-                                              .render(**params))
+        createManipulate = ",\n".join( _iter_create_manipulate(
+            species, density_profile, initial_charge, params) )
 
         # add manipulator applications
-        if len(createManipulate_list) != 0:
+        if createManipulate:
             template_speciesInitialization['Appendable'][',\n']\
-                ['CreateManipulate']  = ",\n".join(createManipulate_list)
+                ['CreateManipulate'] = createManipulate
 
         # Density profile
         template_density = {}
@@ -295,14 +310,14 @@ class Particle:
                 tmpt_loc = []
                 for profile_index, prof in enumerate(density_profile):
                     params['profile_index'] = str(profile_index)
-                    tmpt_loc.append( Template(densityProfile[prof['name']] )\
+                    tmpt_loc.append( _compiled(densityProfile[prof['name']] )\
                         .render(**{**prof, **params}) )
 
                 tmpt_loc = '\n'.join(tmpt_loc)
             else:
                 # if single entry set index to 0
                 params['profile_index'] = '0'
-                tmpt_loc = Template( densityProfile[density_profile['name']] )\
+                tmpt_loc = _compiled( densityProfile[density_profile['name']] )\
                     .render(**{**density_profile, **params})
 
             # add density profiles
@@ -1,7 +1,7 @@
-from mako.template import Template
 from scipy.constants import c
 import numpy as np
 
+from .codelets import _compiled
 from .codelets.run import plugins
 
 class Plugin:
@@ -33,7 +33,7 @@ class Plugin:
         template_run['Appendable'][' '] = {}
 
         template_run['Appendable']['\n']['Plugin']=\
-            Template(plugins[type]).render(**params)
+            _compiled(plugins[type]).render(**params)
 
         template_run['Appendable'][' ']['PluginName'] = \
             f"!TBG_{name}_{period:d}"
@@ -1,9 +1,91 @@
+from collections import defaultdict
+from functools import lru_cache
 from mako.template import Template
 import os
 
 from pogit import __path__ as src_path
 templatePath = src_path[0] + '/templates/'
 
+@lru_cache(maxsize=None)
+def _get_template( filename ):
+    """
+    Load and compile the template file only once per session
+    """
+    return Template( filename=templatePath+filename )
+
+def _render_and_write( filename, objectTemplates, path_include, path_etc ):
+    """
+    Render the template file with the codelets of the objects
+    templates affecting it, and write the result to the proper folder.
+    Returns the name of the written file
+    """
+    # create Mako template
+    template = _get_template( filename )
+
+    # define dictionaries for main and appendable arguments
+    templateMain = {}
+    templateAppendable = {}
+    MainDone = False
+
+    # loop through the templates affecting current template file
+    for objectTemplate in objectTemplates:
+        # Add main template arguments (once per template)
+        objectMain = objectTemplate.get('Main')
+        if objectMain is not None and not MainDone:
+            templateMain = objectMain
+            MainDone = True
+
+        # check if object has any appendable codelets are defined
+        objectAppendable = objectTemplate.get('Appendable')
+        if objectAppendable is None:
+            continue
+
+        # separator is something like '\n', ',\n', ' '
+        for separator, codelets in objectAppendable.items():
+            # initialize separator dictionary if needed
+            if separator not in templateAppendable:
+                templateAppendable[separator] = {}
+
+            # append object codelets to corresponding template lists
+            for arg, codelet in codelets.items():
+                # initialize a list for the codelet if needed
+                if arg not in templateAppendable[separator]:
+                    templateAppendable[separator][arg] = []
+
+                # append codelet to the template list
+                templateAppendable[separator][arg].append(codelet)
+
+    # Merge all arguments into a master dictionary, joining appendable
+    # codelets with proper separators (later separators take precedence
+    # over earlier ones and over the main arguments)
+    templateArgs = dict(templateMain)
+    for separator, codeletLists in templateAppendable.items():
+        for arg, codelets in codeletLists.items():
+            templateArgs[arg] = separator.join(codelets)
+
+    # define the destination file
+    if filename.split('.')[0] == 'run':
+        filename_dest = filename.replace('template', 'cfg')
+        path_dest = path_etc + filename_dest
+    else:
+        filename_dest = filename.replace('template', 'param')
+        path_dest = path_include + filename_dest
+
+    # render the template and replace the file atomically
+    rendered = template.render_unicode(**templateArgs).encode('utf-8')
+    path_tmp = path_dest + '.tmp'
+    try:
+        with open(path_tmp, mode='wb') as file:
+            file.write(rendered)
+        os.replace(path_tmp, path_dest)
+    except BaseException:
+        # do not leave partially written files in the input tree
+        if os.path.exists(path_tmp):
+            os.remove(path_tmp)
+        raise
+
+    return filename_dest
+
 def WriteSimulationFiles( objs ):
     """
     Method which renders all temaplates from the given objects
@@ -17,90 +99,19 @@ def WriteSimulationFiles( objs ):
 
     # Create folders if needed (for tests)
     for p in (path_include, path_etc):
-        if os.path.exists(p) == False :
-            try:
-                os.makedirs(p)
-            except OSError :
-                pass
-
-    # List all template files affected by the objects
-    FilesList = []
+        os.makedirs(p, exist_ok=True)
+
+    # Group object templates by the template files they affect
+    by_file = defaultdict(list)
     for obj in objs:
         for objectTemplate in obj.templates:
-            if objectTemplate['filename'] not in FilesList:
-                FilesList.append(objectTemplate['filename'])
-
-    # Render all listed template files from all objects
-    for filename in FilesList:
-        # create Mako template
-        template = Template( filename=templatePath+filename )
-
-        # define dictionaries for main and appendable arguments
-        templateMain = {}
-        templateAppendable = {}
-        MainDone = False
-
-        # loop through the objects
-        for obj in objs:
-            # loop through the templates of the object
-            for objectTemplate in obj.templates:
-                # check if object affects current template file
-                if objectTemplate['filename'] != filename:
-                    continue
-
-                args = objectTemplate.keys()  # object arguments list
-
-                # Add main template arguments (once per template)
-                if 'Main' in args and not MainDone:
-                    templateMain = objectTemplate['Main']
-                    MainDone = True
-
-                # check if object has any appendable codelets are defined
-                if 'Appendable' not in args:
-                    continue
-
-                # separator is something like '\n', ',\n', ' '
-                for separator in objectTemplate['Appendable'].keys():
-                    # initialize separator dictionary if needed
-                    if separator not in templateAppendable.keys():
-                        templateAppendable[separator] = {}
-
-                    # append object codelets to corresponding template lists
-                    args = objectTemplate['Appendable'][separator].keys()
-                    for arg in args:
-                        # initialize a list for the codelet if needed
-                        if arg not in templateAppendable[separator].keys():
-                            templateAppendable[separator][arg] = []
-
-                        # append codelet to the template list
-                        templateAppendable[separator][arg].append( \
-                            objectTemplate['Appendable'][separator][arg])
-
-        # join appendable codelets with proper separators
-        for separator in templateAppendable.keys():
-            for arg in templateAppendable[separator].keys():
-                # Do only for non-empty lists
-                if len(templateAppendable[separator][arg])>0:
-                    templateAppendable[separator][arg] = \
-                        separator.join(templateAppendable[separator][arg])
-
-        # Merge all arguments into a master dictionary
-        templateArgs = { **templateMain}
-        for separator in templateAppendable.keys():
-            templateArgs = {**templateArgs, **templateAppendable[separator]}
-
-        # render the template and write the files
-        if filename.split('.')[0] == 'run':
-            filename_dest = filename.replace('template', 'cfg')
-            with open(path_etc + filename_dest, mode='w') as file:
-                file.writelines(template.render(**templateArgs))
-        else:
-            filename_dest = filename.replace('template', 'param')
-            with open(path_include+filename_dest, mode='w') as file:
-                file.writelines(template.render(**templateArgs))
+            by_file[objectTemplate['filename']].append(objectTemplate)
 
+    # Render and write all listed template files
+    for filename, objectTemplates in by_file.items():
         # print the name of the file
-        print('\t', filename_dest)
+        print('\t', _render_and_write( filename, objectTemplates,
+                                        path_include, path_etc ))
 
 def WriteAndSubmit( objs, sim_name='run', output_path="$PIC_SCRATCH",
                     write_input=True, build=True, run=True, s='bash',